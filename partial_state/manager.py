@@ -1,9 +1,29 @@
-from django.db import models
+import base64
+import datetime
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models, router, transaction
 from django.db.models.functions import Now
 
 __all__ = ['PartialObjectManager']
 
 
+class StateDumpEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder truncates to milliseconds, which would make
+    #  dump/load round trips lossy
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        # BinaryField.to_python() decodes base64 strings on the way back
+        if isinstance(o, (bytes, memoryview)):
+            return base64.b64encode(o).decode('ascii')
+        return super().default(o)
+
+
 class PartialObjectDescriptor:
     def __init__(self, state_model, manager_factory):
         self.state_model = state_model
@@ -67,3 +87,155 @@ class PartialObjectManager(models.Manager):
 
         qs_filter = {self.wrapped_model._meta.pk.attname: pk}
         return self.get_queryset().filter(**qs_filter).latest()
+
+    def _dump_fields(self, keep_ids=True):
+        for f in self.model._meta.concrete_fields:
+            if f.primary_key and not keep_ids:
+                continue
+            yield f
+
+    def dump(self, stream, keep_ids=True, chunk_size=2000):
+        """
+        Stream the partial objects in this manager's queryset to a file-like
+        object in JSON lines format (one object per line, keyed by attname).
+        Rows are fetched with :meth:`models.QuerySet.iterator`, so the table
+        is never loaded into memory in its entirety.
+
+        :param stream:
+            Text stream to write to.
+        :param keep_ids:
+            Include the `partial_state_id` column in the output.
+        :param chunk_size:
+            Number of rows to fetch from the database at a time.
+        :return:
+            The number of objects written.
+        """
+        attnames = [f.attname for f in self._dump_fields(keep_ids)]
+        rows = self.get_queryset().order_by().values_list(*attnames)
+        count = 0
+        for row in rows.iterator(chunk_size=chunk_size):
+            stream.write(json.dumps(dict(zip(attnames, row)),
+                                    cls=StateDumpEncoder))
+            stream.write('\n')
+            count += 1
+        return count
+
+    def load(self, stream, keep_ids=True, reset_expiry=True,
+             batch_size=2000):
+        """
+        Load partial objects from a JSON lines stream produced by
+        :meth:`dump`, using :meth:`models.QuerySet.bulk_create`.
+        Model-level `save()` logic and signals are bypassed.
+
+        :param stream:
+            Text stream to read from.
+        :param keep_ids:
+            Restore the `partial_state_id` values from the dump.
+            If `False`, new IDs are assigned by the database, and any IDs
+            present in the dump are ignored.
+            If `True`, the table's ID sequence is reset afterwards (where the
+            backend requires it).
+        :param reset_expiry:
+            Ignore the `partial_state_expiry` values in the dump, and compute
+            fresh ones based on the state lifetime instead. Without this,
+            a snapshot loaded long after it was dumped would consist of
+            expired objects.
+            Has no effect if the state model does not use expiry timestamps.
+        :param batch_size:
+            Number of objects to insert per query.
+        :return:
+            The number of objects loaded.
+        :raises ValueError:
+            If the dump contains keys that do not correspond to a column of
+            the partial state table, or values that cannot be converted to
+            the type of their column. In either case, nothing is loaded.
+        """
+        fields = {f.attname: f for f in self._dump_fields(keep_ids)}
+        pk_attname = self.model._meta.pk.attname
+
+        def objects():
+            for lineno, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if not keep_ids:
+                    row.pop(pk_attname, None)
+                if reset_expiry and self.model._state_expires:
+                    row.pop('partial_state_expiry', None)
+                unknown = row.keys() - fields.keys()
+                if unknown:
+                    raise ValueError(
+                        'Unknown columns in dump of %s, line %d: %s' % (
+                            self.model._meta.label, lineno,
+                            ', '.join(sorted(unknown))
+                        )
+                    )
+                values = {}
+                for attname, value in row.items():
+                    try:
+                        values[attname] = fields[attname].to_python(value)
+                    except ValidationError as e:
+                        raise ValueError(
+                            'Invalid value for column %s in dump of %s, '
+                            'line %d: %s' % (
+                                attname, self.model._meta.label, lineno,
+                                '; '.join(e.messages)
+                            )
+                        ) from e
+                yield self.model(**values)
+
+        return self._bulk_insert(
+            objects(), batch_size, reset_sequences=keep_ids
+        )
+
+    def generate(self, count, values=None, batch_size=2000):
+        """
+        Bulk-create synthetic partial objects, e.g. for test fixtures.
+
+        :param count:
+            Number of objects to create.
+        :param values:
+            Either a dictionary of attribute values shared by all objects, or
+            a callable that takes the index of the object being generated and
+            returns such a dictionary. Fields that are not specified are left
+            at their defaults.
+        :param batch_size:
+            Number of objects to insert per query.
+        :return:
+            The number of objects created.
+        """
+        if values is None:
+            values = {}
+
+        def objects():
+            for ix in range(count):
+                kwargs = values(ix) if callable(values) else values
+                yield self.model(**kwargs)
+
+        return self._bulk_insert(objects(), batch_size)
+
+    def _bulk_insert(self, objs, batch_size, reset_sequences=False):
+        # self.db is routed for reads, so pin everything to the write database
+        db = self._db or router.db_for_write(self.model)
+        manager = self.db_manager(db)
+        # consume the generator in slices to keep memory usage bounded
+        count = 0
+        with transaction.atomic(using=db):
+            while True:
+                batch = list(islice(objs, batch_size))
+                if not batch:
+                    break
+                manager.bulk_create(batch, batch_size=batch_size)
+                count += len(batch)
+            if reset_sequences:
+                # explicit PKs don't advance the ID sequence on e.g. Postgres,
+                #  so reset it like loaddata does
+                connection = connections[db]
+                sql_list = connection.ops.sequence_reset_sql(
+                    no_style(), [self.model]
+                )
+                if sql_list:
+                    with connection.cursor() as cursor:
+                        for sql in sql_list:
+                            cursor.execute(sql)
+        return count
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:58
+
+import partial_state.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestC',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('column1', models.IntegerField()),
+                ('payload', models.BinaryField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TestCPartialState',
+            fields=[
+                ('column1', models.IntegerField(null=True)),
+                ('payload', models.BinaryField(null=True)),
+                ('partial_state_id', models.AutoField(primary_key=True, serialize=False)),
+            ],
+            options={
+                'db_table': 'tests_testc_partialstate',
+                'ordering': ('-partial_state_id',),
+                'get_latest_by': 'partial_state_id',
+            },
+            bases=(models.Model, partial_state.models.PartialStateMixin),
+        ),
+    ]
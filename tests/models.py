@@ -20,6 +20,14 @@ class TestB(models.Model):
     partial = PartialStateRecord(state_lifetime=timedelta(days=3))
 
 
+class TestC(models.Model):
+
+    column1 = models.IntegerField()
+    payload = models.BinaryField()
+
+    partial = PartialStateRecord()
+
+
 class User(models.Model):
     email = models.EmailField(max_length=250)
     somenumber = models.IntegerField()
@@ -1,5 +1,9 @@
+import io
+from datetime import timedelta
+
 from django.db import IntegrityError
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.utils import timezone
 from . import models
 
 
@@ -71,3 +75,184 @@ class TestInheritanceScenario(TestCase):
         self.assertFalse(models.Profile.partial.filter(pk=partial_pk).exists())
 
         self.assertEqual('abc@example.com', obj.email)
+
+
+class TestBulkFixtures(TestCase):
+
+    def test_generate(self):
+        count = models.TestA.partial.generate(
+            50, lambda ix: {'column1': ix}, batch_size=20
+        )
+        self.assertEqual(count, 50)
+        self.assertEqual(models.TestA.partial.count(), 50)
+        self.assertEqual(
+            models.TestA.partial.filter(column1__gte=25).count(), 25
+        )
+        self.assertFalse(
+            models.TestA.partial.filter(column2__isnull=False).exists()
+        )
+
+    def test_generate_expiry_default(self):
+        models.TestB.partial.generate(10, {'column2': 'abcde'})
+        qs = models.TestB.partial.filter(partial_state_expiry__isnull=False)
+        self.assertEqual(qs.count(), 10)
+
+    def test_dump_load_roundtrip(self):
+        models.TestB.partial.generate(
+            30, lambda ix: {'column1': ix, 'column2': str(ix)}
+        )
+        original = list(
+            models.TestB.partial.order_by('partial_state_id').values()
+        )
+        stream = io.StringIO()
+        self.assertEqual(models.TestB.partial.dump(stream, chunk_size=7), 30)
+
+        models.TestB.partial.all().delete()
+        stream.seek(0)
+        loaded = models.TestB.partial.load(
+            stream, reset_expiry=False, batch_size=7
+        )
+        self.assertEqual(loaded, 30)
+        restored = list(
+            models.TestB.partial.order_by('partial_state_id').values()
+        )
+        self.assertEqual(original, restored)
+
+        # the table should still be usable after restoring explicit IDs
+        partial_obj = models.TestB(column1=100).partial
+        partial_obj.save()
+        self.assertNotIn(
+            partial_obj.pk, [row['partial_state_id'] for row in original]
+        )
+        partial_obj = models.TestB.partial.by_partial_state_id(partial_obj.pk)
+        self.assertEqual(partial_obj.column1, 100)
+
+    def test_load_reset_expiry(self):
+        stale = (timezone.now() - timedelta(days=10)).isoformat()
+        dump = ''.join(
+            '{"column1": %d, "partial_state_expiry": "%s"}\n' % (ix, stale)
+            for ix in range(5)
+        )
+        models.TestB.partial.load(io.StringIO(dump), keep_ids=False)
+        self.assertEqual(models.TestB.partial.count(), 5)
+
+        # keep the stale timestamps this time
+        models.TestB.partial.load(
+            io.StringIO(dump), keep_ids=False, reset_expiry=False
+        )
+        self.assertEqual(models.TestB.partial.count(), 5)
+        self.assertEqual(models.TestB.partial.purge_expired()[0], 5)
+
+    def test_load_advances_ids(self):
+        # restore IDs that the table's ID generator hasn't handed out yet,
+        #  as happens when loading a dump into a fresh database
+        probe = models.TestA(column1=0).partial
+        probe.save()
+        next_id = probe.pk + 1
+        probe.delete()
+        stream = io.StringIO(''.join(
+            '{"partial_state_id": %d, "column1": %d}\n' % (next_id + ix, ix)
+            for ix in range(10)
+        ))
+        models.TestA.partial.load(stream)
+
+        partial_obj = models.TestA(column1=100).partial
+        partial_obj.save()
+        self.assertGreaterEqual(partial_obj.pk, next_id + 10)
+        partial_obj = models.TestA.partial.by_partial_state_id(partial_obj.pk)
+        self.assertEqual(partial_obj.column1, 100)
+
+    def test_load_new_ids(self):
+        models.TestA.partial.generate(5, {'column2': 'abcde'})
+        stream = io.StringIO()
+        models.TestA.partial.dump(stream, keep_ids=False)
+        stream.seek(0)
+        models.TestA.partial.load(stream, keep_ids=False)
+        self.assertEqual(
+            models.TestA.partial.filter(column2='abcde').count(), 10
+        )
+
+    def test_dump_load_fk(self):
+        user = models.User(email='abc@example.com', somenumber=5)
+        user.save()
+        models.Profile.partial.generate(3, {'user_ptr_id': user.pk})
+        stream = io.StringIO()
+        models.Profile.partial.dump(stream)
+        models.Profile.partial.all().delete()
+        stream.seek(0)
+        models.Profile.partial.load(stream)
+        self.assertEqual(
+            models.Profile.partial.filter(user_ptr=user).count(), 3
+        )
+
+    def test_dump_load_binary(self):
+        payloads = [b'', b'\x00\xffabc', bytes(range(256))]
+        models.TestC.partial.generate(
+            len(payloads), lambda ix: {'column1': ix, 'payload': payloads[ix]}
+        )
+        stream = io.StringIO()
+        models.TestC.partial.dump(stream)
+        models.TestC.partial.all().delete()
+        stream.seek(0)
+        models.TestC.partial.load(stream)
+        restored = models.TestC.partial.order_by('column1')
+        self.assertEqual([bytes(obj.payload) for obj in restored], payloads)
+
+    def test_load_unknown_column(self):
+        stream = io.StringIO('{"column1": 5, "column3": "abc"}\n')
+        with self.assertRaises(ValueError):
+            models.TestA.partial.load(stream)
+        self.assertFalse(models.TestA.partial.exists())
+
+    def test_load_invalid_value(self):
+        stream = io.StringIO(
+            '{"column1": 1}\n'
+            '{"column1": 2}\n'
+            '{"column1": "abc"}\n'
+        )
+        with self.assertRaisesRegex(ValueError, 'column1.*line 3'):
+            models.TestA.partial.load(stream, batch_size=1)
+        # earlier batches should be rolled back
+        self.assertFalse(models.TestA.partial.exists())
+
+
+class ReplicaRouter:
+    # reads go to the replica, writes to the primary
+
+    def db_for_read(self, model, **hints):
+        return 'other'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+
+@override_settings(DATABASE_ROUTERS=[ReplicaRouter()])
+class TestBulkFixturesRouting(TestCase):
+    databases = {'default', 'other'}
+
+    def test_load_uses_write_db(self):
+        stream = io.StringIO(
+            '{"partial_state_id": 1, "column1": 1}\n'
+            '{"partial_state_id": 2, "column1": 2}\n'
+        )
+        self.assertEqual(models.TestA.partial.load(stream), 2)
+        self.assertEqual(
+            models.TestA.partial.db_manager('default').count(), 2
+        )
+        self.assertFalse(models.TestA.partial.db_manager('other').exists())
+
+    def test_generate_uses_write_db(self):
+        models.TestA.partial.generate(3, {'column1': 1})
+        self.assertEqual(
+            models.TestA.partial.db_manager('default').count(), 3
+        )
+        self.assertFalse(models.TestA.partial.db_manager('other').exists())
+
+    def test_load_rollback_on_write_db(self):
+        stream = io.StringIO(
+            '{"column1": 1}\n'
+            '{"column1": "abc"}\n'
+        )
+        with self.assertRaises(ValueError):
+            models.TestA.partial.load(stream, batch_size=1)
+        self.assertFalse(models.TestA.partial.db_manager('default').exists())
@@ -13,7 +13,11 @@ DATABASES = {
     'default': {
         'NAME': ':memory:',
         'ENGINE': 'django.db.backends.sqlite3'
-    }
+    },
+    'other': {
+        'NAME': ':memory:',
+        'ENGINE': 'django.db.backends.sqlite3'
+    },
 }
 
 ROOT_URLCONF = 'tests.urls'